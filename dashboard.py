@@ -1,7 +1,9 @@
+import argparse
 import streamlit as st
 from datetime import datetime
 import pandas as pd
-from features.common.utils import load_transactions, load_budgets
+from features.common import utils
+from features.server.client import get_budget_status, get_ledger_totals, load_recent_transactions
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -52,20 +54,30 @@ def main():
 
     st.title("💰 Personal Finance Dashboard")
 
-    # Load data
-    transactions_df = load_transactions()
-    budgets = load_budgets()
-
-    if transactions_df.empty:
+    # --- Ledger Selection (the CLI passes its active ledger after "--") ---
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ledger", default=utils.DEFAULT_LEDGER)
+    args, _ = parser.parse_known_args()
+    ledgers = utils.list_ledgers()
+    default_index = ledgers.index(args.ledger) if args.ledger in ledgers else 0
+    ledger = st.sidebar.selectbox("Ledger", ledgers, index=default_index)
+
+    # Only aggregates and the rows on screen are loaded (served warm by the API server when it is running)
+    current_month = datetime.now().strftime("%Y-%m")
+    totals = get_ledger_totals(ledger)
+    budget_status = get_budget_status(current_month, ledger)
+    recent_df = load_recent_transactions(10, ledger)
+
+    if totals["transaction_count"] == 0:
         st.warning("No transaction data found. Please add transactions in the CLI.")
         return
 
     # --- Balance Section ---
     with st.container():
         st.header("Current Balance")
-        total_income = transactions_df[transactions_df['Type'] == 'Income']['Amount'].sum()
-        total_expense = transactions_df[transactions_df['Type'] == 'Expense']['Amount'].sum()
-        balance = total_income - total_expense
+        total_income = totals["income_paisa"] / 100
+        total_expense = totals["expense_paisa"] / 100
+        balance = totals["net_paisa"] / 100
 
         col1, col2, col3 = st.columns(3)
         col1.metric("Total Income", f"Rs {total_income:,.2f}")
@@ -77,28 +89,23 @@ def main():
     # --- Budget Status Section ---
     with st.container():
         st.header("Budget Status (Current Month)")
-        if not budgets:
+        budgeted = [row for row in budget_status["status"] if row["budget_paisa"] > 0]
+        if not budgeted:
             st.info("No budgets set. Use the CLI to set budgets.")
         else:
-            current_month = datetime.now().strftime("%Y-%m")
-            monthly_expenses = transactions_df[
-                (transactions_df['Type'] == 'Expense') &
-                (transactions_df['Date'].str.startswith(current_month))
-            ]
-            expense_by_cat = monthly_expenses.groupby('Category')['Amount'].sum()
-
-            for category, budget_amount in budgets.items():
-                spent_amount = expense_by_cat.get(category, 0)
-                percentage = (spent_amount / budget_amount) * 100 if budget_amount > 0 else 0
+            status_colors = {"OVER": "red", "Warning": "orange", "OK": "green"}
+
+            for row in budgeted:
+                spent_amount = row["spent_paisa"] / 100
+                budget_amount = row["budget_paisa"] / 100
                 
-                st.subheader(category)
+                st.subheader(row["category"])
                 col1, col2 = st.columns([3, 1])
                 with col1:
-                    st.progress(min(int(percentage), 100))
+                    st.progress(min(int(row["utilization"]), 100))
                 with col2:
-                    status_color = "red" if percentage > 100 else "orange" if percentage >= 70 else "green"
-                    status_text = "OVER" if percentage > 100 else "Warning" if percentage >= 70 else "OK"
-                    st.markdown(f"**<font color='{status_color}'>{status_text}</font>**", unsafe_allow_html=True)
+                    status_color = status_colors[row["status"]]
+                    st.markdown(f"**<font color='{status_color}'>{row['status']}</font>**", unsafe_allow_html=True)
 
                 st.text(f"Spent: Rs {spent_amount:,.2f} / Budget: Rs {budget_amount:,.2f}")
                 st.text("")
@@ -117,9 +124,9 @@ def main():
             
             display_df = df[['Date', 'Type', 'Category', 'Description', 'Amount']].copy()
             display_df['Amount'] = display_df['Amount'].apply(lambda x: f"Rs {x:,.2f}")
-            return display_df.tail(10).style.apply(row_styler, axis=1)
+            return display_df.style.apply(row_styler, axis=1)
 
-        styler = style_transactions(transactions_df)
+        styler = style_transactions(recent_df)
         st.dataframe(styler, use_container_width=True)
 
 
@@ -5,7 +5,7 @@ from rich.panel import Panel
 from rich.progress_bar import ProgressBar
 from datetime import datetime
 import calendar
-from features.common.utils import load_transactions, load_budgets
+from features.server.client import get_monthly_summary, get_health_score
 
 # Initialize Rich Console
 console = Console()
@@ -30,16 +30,15 @@ def generate_monthly_report():
         console.print("[bold red]Invalid format. Please use YYYY-MM.[/bold red]")
         return
 
-    transactions_df = load_transactions()
-    monthly_df = transactions_df[transactions_df['Date'].str.startswith(month_to_analyze)]
+    summary = get_monthly_summary(month_to_analyze)
 
-    if monthly_df.empty:
+    if summary["transaction_count"] == 0:
         console.print(f"[bold]No transactions found for {month_to_analyze}.[/bold]")
         return
 
-    total_income = monthly_df[monthly_df['Type'] == 'Income']['Amount'].sum()
-    total_expense = monthly_df[monthly_df['Type'] == 'Expense']['Amount'].sum()
-    net_savings = total_income - total_expense
+    total_income = summary["income_paisa"] / 100
+    total_expense = summary["expense_paisa"] / 100
+    net_savings = summary["net_paisa"] / 100
 
     summary_text = (
         f"Total Income:  [bold green]{total_income:.2f}[/bold green]\n"
@@ -48,17 +47,18 @@ def generate_monthly_report():
     )
     console.print(Panel(summary_text, title=f"[bold]Financial Summary for {month_to_analyze}[/bold]", expand=False))
 
-    expense_by_category = monthly_df[monthly_df['Type'] == 'Expense'].groupby('Category')['Amount'].sum()
+    expense_by_category = summary["expense_by_category_paisa"]
 
-    if not expense_by_category.empty:
+    if expense_by_category:
         table = Table(show_header=True, header_style="bold magenta")
         table.add_column("Expense Category", style="cyan")
         table.add_column("Amount", justify="right")
         table.add_column("% of Total", justify="right")
 
-        sorted_categories = expense_by_category.sort_values(ascending=False)
+        sorted_categories = sorted(expense_by_category.items(), key=lambda item: item[1], reverse=True)
 
-        for category, amount in sorted_categories.items():
+        for category, amount_paisa in sorted_categories:
+            amount = amount_paisa / 100
             percentage = (amount / total_expense) * 100 if total_expense > 0 else 0
             table.add_row(category, f"{amount:.2f}", f"{percentage:.1f}%")
         
@@ -82,33 +82,36 @@ def spending_analysis():
         console.print("[bold red]Month not provided. Aborting.[/bold red]")
         return
 
-    transactions_df = load_transactions()
-    monthly_df = transactions_df[transactions_df['Date'].str.startswith(month_to_analyze)]
+    summary = get_monthly_summary(month_to_analyze)
     
-    if monthly_df.empty:
+    if summary["transaction_count"] == 0:
         console.print(f"[bold]No transactions found for {month_to_analyze}.[/bold]")
         return
 
-    total_expense = monthly_df[monthly_df['Type'] == 'Expense']['Amount'].sum()
-    expense_by_category = monthly_df[monthly_df['Type'] == 'Expense'].groupby('Category')['Amount'].sum()
+    total_expense = summary["expense_paisa"] / 100
 
     if total_expense == 0:
         console.print("[bold green]No expenses to analyze for this month.[/bold green]")
         return
 
     console.print("\n[bold]Spending by Category (ASCII Chart)[/bold]")
-    sorted_categories = expense_by_category.sort_values(ascending=False)
+    sorted_categories = [
+        (category, amount_paisa / 100)
+        for category, amount_paisa in sorted(
+            summary["expense_by_category_paisa"].items(), key=lambda item: item[1], reverse=True
+        )
+    ]
     
-    max_len_category = max(len(cat) for cat in sorted_categories.index) if not sorted_categories.empty else 0
+    max_len_category = max(len(cat) for cat, _ in sorted_categories) if sorted_categories else 0
 
-    for category, amount in sorted_categories.items():
+    for category, amount in sorted_categories:
         percentage = (amount / total_expense) * 100
         bar_length = int(percentage / 2) # Scale to 50 characters max
         bar = '█' * bar_length
         console.print(f"{category.ljust(max_len_category)} | {bar} {percentage:.1f}%")
 
     console.print("\n[bold]Top 3 Spending Categories[/bold]")
-    for i, (category, amount) in enumerate(sorted_categories.head(3).items()):
+    for i, (category, amount) in enumerate(sorted_categories[:3]):
         console.print(f"{i+1}. {category}: [bold red]{amount:.2f}[/bold red]")
 
     year, month = map(int, month_to_analyze.split('-'))
@@ -131,35 +134,13 @@ def financial_health_score():
         console.print("[bold red]Month not provided. Aborting.[/bold red]")
         return
 
-    transactions_df = load_transactions()
-    monthly_df = transactions_df[transactions_df['Date'].str.startswith(month_to_analyze)]
+    health = get_health_score(month_to_analyze)
 
-    if monthly_df.empty:
+    if health["transaction_count"] == 0:
         console.print(f"[bold]No transactions found for {month_to_analyze}.[/bold]")
         return
 
-    total_income = monthly_df[monthly_df['Type'] == 'Income']['Amount'].sum()
-    total_expense = monthly_df[monthly_df['Type'] == 'Expense']['Amount'].sum()
-    expense_by_category = monthly_df[monthly_df['Type'] == 'Expense'].groupby('Category')['Amount'].sum().to_dict()
-    
-    savings_rate_score = 0
-    if total_income > 0:
-        savings_rate = (total_income - total_expense) / total_income
-        savings_rate_score = max(0, min(savings_rate / 0.2, 1)) * 60
-
-    budgets = load_budgets()
-    budget_adherence_score = 0
-    if budgets:
-        on_budget_count = 0
-        for category, budget_amount in budgets.items():
-            spent_amount = expense_by_category.get(category, 0)
-            if spent_amount <= budget_amount:
-                on_budget_count += 1
-        
-        if len(budgets) > 0:
-            budget_adherence_score = (on_budget_count / len(budgets)) * 40
-
-    total_score = savings_rate_score + budget_adherence_score
+    total_score = health["score"]
 
     if total_score >= 80:
         interpretation, reco = "[bold green]Excellent! You are managing your finances very well.[/bold green]", "Keep up the great habits. Consider allocating more to investments."
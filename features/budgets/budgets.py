@@ -4,7 +4,8 @@ from rich.table import Table
 from rich.progress_bar import ProgressBar
 from rich.panel import Panel
 from datetime import datetime
-from features.common.utils import load_budgets, get_spending_for_month
+from features.common import utils
+from features.server.client import get_budget_status
 
 # Initialize Rich Console
 console = Console()
@@ -12,9 +13,6 @@ console = Console()
 # Budget categories from GEMINI.md
 BUDGET_CATEGORIES = ["Food", "Transport", "Shopping", "Bills", "Entertainment", "Health", "Other"]
 
-# Database files
-BUDGETS_FILE = "database/budgets.txt"
-
 
 def set_budget():
     """Sets a monthly budget for a specific category."""
@@ -46,7 +44,7 @@ def set_budget():
 
     # Read existing budgets
     try:
-        with open(BUDGETS_FILE, "r") as f:
+        with open(utils.BUDGETS_FILE, "r") as f:
             lines = f.readlines()
     except FileNotFoundError:
         lines = []
@@ -68,21 +66,20 @@ def set_budget():
 
     # Write back to the file
     try:
-        with open(BUDGETS_FILE, "w") as f:
+        with open(utils.BUDGETS_FILE, "w") as f:
             f.writelines(new_lines)
         console.print(f"\n[bold green]Success![/bold green] Budget for [bold]{category}[/bold] set to {amount_str}.")
     except IOError as e:
-        console.print(f"[bold red]Error writing to file {BUDGETS_FILE}: {e}[/bold red]")
+        console.print(f"[bold red]Error writing to file {utils.BUDGETS_FILE}: {e}[/bold red]")
 
 def view_budgets():
     """Displays a table of budgets, spending, and utilization."""
     console.print("\n[bold yellow]-- Monthly Budget Status --[/bold yellow]")
     
-    budgets = load_budgets() # Using shared function
     current_month = datetime.now().strftime("%Y-%m")
-    spending = get_spending_for_month(current_month) # Using shared function
+    budget_status = get_budget_status(current_month) # Served by the API server when it is running
 
-    if not budgets:
+    if not budget_status["budgets_paisa"]:
         console.print("[bold]No budgets set. Use 'Set Budget' to create one.[/bold]")
         return
 
@@ -98,27 +95,23 @@ def view_budgets():
     total_spent = 0
     over_budget_categories = []
 
-    all_categories = set(budgets.keys()) | set(spending.keys())
-
-    for category in sorted(list(all_categories)):
-        budget_amount = budgets.get(category, 0)
-        spent_amount = spending.get(category, 0)
-        remaining = budget_amount - spent_amount
-        
-        if budget_amount > 0:
-            utilization = (spent_amount / budget_amount) * 100
-        else:
-            utilization = 0 if spent_amount == 0 else 100
-        
-        if budget_amount == 0 and spent_amount > 0:
-            status, remaining_style = "[bold yellow]No Budget[/bold yellow]", "yellow"
-        elif utilization > 100:
-            status, remaining_style = "[bold red]OVER[/bold red]", "red"
+    status_styles = {
+        "No Budget": ("[bold yellow]No Budget[/bold yellow]", "yellow"),
+        "OVER": ("[bold red]OVER[/bold red]", "red"),
+        "Warning": ("[bold yellow]Warning[/bold yellow]", "yellow"),
+        "OK": ("[green]OK[/green]", "green"),
+    }
+
+    for row in budget_status["status"]:
+        category = row["category"]
+        budget_amount = row["budget_paisa"] / 100
+        spent_amount = row["spent_paisa"] / 100
+        remaining = row["remaining_paisa"] / 100
+        utilization = row["utilization"]
+
+        status, remaining_style = status_styles[row["status"]]
+        if row["status"] == "OVER":
             over_budget_categories.append(category)
-        elif utilization >= 70:
-            status, remaining_style = "[bold yellow]Warning[/bold yellow]", "yellow"
-        else:
-            status, remaining_style = "[green]OK[/green]", "green"
             
         progress = ProgressBar(total=100, completed=min(utilization, 100), width=15)
 
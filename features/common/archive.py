@@ -0,0 +1,316 @@
+import gzip
+import json
+import os
+import struct
+from contextlib import contextmanager
+from datetime import datetime
+
+# fcntl is POSIX-only: without it (Windows) ledger_lock() does not lock.
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# --- Segment Layout ---
+# Each closed month lives in its own segment file:
+#   [gzip-compressed columnar JSON payload][footer JSON][footer length (4 bytes)][MAGIC]
+# The footer holds per-type and per-category totals so summaries never need
+# to decompress the payload.
+SEGMENT_SUFFIX = ".seg"
+MAGIC = b"PFT1"
+FOOTER_LENGTH = struct.Struct("<I")
+COLUMNS = ["date", "type", "category", "amount_paisa", "description"]
+
+# Lists the pending renames of a compaction once all its files are staged
+JOURNAL_FILE = "_compaction.json"
+# Held by anything that writes the hot file, so appends and compactions never overlap
+LOCK_FILE = ".lock"
+
+# Months kept in the hot text file (the current month counts as one)
+KEEP_HOT_MONTHS = 3
+
+
+def segment_path(archive_dir: str, month: str):
+    return os.path.join(archive_dir, f"{month}{SEGMENT_SUFFIX}")
+
+
+def list_archived_months(archive_dir: str):
+    """Returns the "YYYY-MM" months that have an archive segment, oldest first."""
+    try:
+        names = os.listdir(archive_dir)
+    except FileNotFoundError:
+        return []
+    return sorted(name[:-len(SEGMENT_SUFFIX)] for name in names if name.endswith(SEGMENT_SUFFIX))
+
+
+def read_segment_footer(archive_dir: str, month: str):
+    """
+    Reads only the summary footer of a month's segment.
+
+    Returns:
+        dict or None: The footer, or None if the month is not archived.
+    """
+    try:
+        with open(segment_path(archive_dir, month), "rb") as f:
+            f.seek(-(FOOTER_LENGTH.size + len(MAGIC)), os.SEEK_END)
+            footer_length, = FOOTER_LENGTH.unpack(f.read(FOOTER_LENGTH.size))
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not an archive segment: {segment_path(archive_dir, month)}")
+            f.seek(-(footer_length + FOOTER_LENGTH.size + len(MAGIC)), os.SEEK_END)
+            return json.loads(f.read(footer_length))
+    except FileNotFoundError:
+        return None
+
+
+def read_segment_columns(archive_dir: str, month: str):
+    """
+    Decompresses a month's segment.
+
+    Returns:
+        dict or None: One list per name in COLUMNS, in original row order, or
+            None if the month is not archived.
+    """
+    footer = read_segment_footer(archive_dir, month)
+    if footer is None:
+        return None
+    with open(segment_path(archive_dir, month), "rb") as f:
+        return json.loads(gzip.decompress(f.read(footer["payload_bytes"])))
+
+
+def read_segment_rows(archive_dir: str, month: str):
+    """
+    Decompresses a month's segment into row tuples.
+
+    Returns:
+        list: (date, type, category, amount_paisa, description) tuples, in original order.
+    """
+    columns = read_segment_columns(archive_dir, month)
+    if columns is None:
+        return []
+    return list(zip(*(columns[name] for name in COLUMNS)))
+
+
+def read_all_archived_rows(archive_dir: str):
+    """Decompresses every segment into row tuples, oldest month first."""
+    rows = []
+    for month in list_archived_months(archive_dir):
+        rows.extend(read_segment_rows(archive_dir, month))
+    return rows
+
+
+def footer_to_summary(footer: dict):
+    """Converts a segment footer into the same shape as summarize_month()."""
+    totals = footer["totals_paisa"]
+    income_paisa = sum(totals.get("Income", {}).values())
+    expense_paisa = sum(totals.get("Expense", {}).values())
+    return {
+        "month": footer["month"],
+        "transaction_count": footer["rows"],
+        "income_paisa": income_paisa,
+        "expense_paisa": expense_paisa,
+        "net_paisa": income_paisa - expense_paisa,
+        "expense_by_category_paisa": dict(totals.get("Expense", {})),
+    }
+
+
+def _stage_segment(archive_dir: str, month: str, rows: list):
+    """Writes a month's new segment next to the current one and returns the temporary path."""
+    columns = {name: [row[i] for row in rows] for i, name in enumerate(COLUMNS)}
+    payload = gzip.compress(json.dumps(columns, separators=(",", ":")).encode("utf-8"), compresslevel=9)
+
+    totals = {}
+    for _, trans_type, category, amount_paisa, _ in rows:
+        by_category = totals.setdefault(trans_type, {})
+        by_category[category] = by_category.get(category, 0) + amount_paisa
+
+    footer = json.dumps({
+        "month": month,
+        "rows": len(rows),
+        "payload_bytes": len(payload),
+        "totals_paisa": totals,
+    }).encode("utf-8")
+
+    os.makedirs(archive_dir, exist_ok=True)
+    path = segment_path(archive_dir, month)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload + footer + FOOTER_LENGTH.pack(len(footer)) + MAGIC)
+        f.flush()
+        os.fsync(f.fileno())
+    return tmp_path
+
+
+@contextmanager
+def ledger_lock(ledger_dir: str):
+    """
+    Holds an exclusive lock on a ledger directory, across processes.
+
+    The lock is not reentrant: nothing called while it is held may take it again.
+    """
+    os.makedirs(ledger_dir, exist_ok=True)
+    with open(os.path.join(ledger_dir, LOCK_FILE), "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _journal_path(archive_dir: str):
+    return os.path.join(archive_dir, JOURNAL_FILE)
+
+
+def _apply_journal(archive_dir: str, renames: list):
+    """Performs the journaled renames (skipping those already done) and drops the journal."""
+    for tmp_path, final_path in renames:
+        try:
+            os.replace(tmp_path, final_path)
+        except FileNotFoundError:
+            # Already renamed, by an earlier attempt or a concurrent loader
+            pass
+    try:
+        os.remove(_journal_path(archive_dir))
+    except FileNotFoundError:
+        pass
+
+
+def finish_interrupted_compaction(archive_dir: str, locked: bool = False):
+    """
+    Completes a compaction that failed after its commit point.
+
+    Until this runs, the new segments and the old hot file can both hold the
+    same rows, so every loader calls it before reading, and every writer before
+    appending (otherwise the journaled rename would overwrite the new rows).
+
+    Args:
+        archive_dir (str): The ledger's archive directory.
+        locked (bool): True if the caller already holds ledger_lock().
+
+    Returns:
+        bool: True if an interrupted compaction was completed.
+    """
+    if not os.path.exists(_journal_path(archive_dir)):
+        return False
+    if not locked:
+        with ledger_lock(os.path.dirname(archive_dir)):
+            return finish_interrupted_compaction(archive_dir, locked=True)
+
+    # Re-read under the lock: another process may have finished it meanwhile
+    try:
+        with open(_journal_path(archive_dir), "r") as f:
+            renames = json.load(f)["renames"]
+    except FileNotFoundError:
+        return False
+    _apply_journal(archive_dir, renames)
+    return True
+
+
+def _discard_staged_files(transactions_file: str, archive_dir: str):
+    """Removes temporary files left by a compaction that failed before its commit point."""
+    stale = [transactions_file + ".tmp", _journal_path(archive_dir) + ".tmp"]
+    try:
+        stale += [os.path.join(archive_dir, name) for name in os.listdir(archive_dir) if name.endswith(".tmp")]
+    except FileNotFoundError:
+        pass
+    for path in stale:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def oldest_hot_month(keep_months: int = KEEP_HOT_MONTHS, today: datetime = None):
+    """Returns the first "YYYY-MM" month that stays in the hot file."""
+    today = today or datetime.now()
+    month_index = today.year * 12 + (today.month - 1) - (keep_months - 1)
+    return f"{month_index // 12:04d}-{month_index % 12 + 1:02d}"
+
+
+def _parse_line(line: str):
+    """Parses a transactions.txt line into a row tuple, or None if it is malformed."""
+    try:
+        date, trans_type, category, amount_paisa, description = line.rstrip("\n").split(',', 4)
+        datetime.strptime(date, "%Y-%m-%d")
+        return (date, trans_type, category, int(amount_paisa), description)
+    except ValueError:
+        return None
+
+
+def compact_ledger(transactions_file: str, archive_dir: str, keep_months: int = KEEP_HOT_MONTHS):
+    """
+    Moves every closed month out of the hot transactions file into archive segments.
+
+    Months already archived are merged with any back-dated rows found in the hot
+    file. Malformed lines and recent months stay in the hot file untouched.
+
+    The move is crash-safe: the new segments and hot file are first written as
+    temporary files, then a journal listing the renames is written (the commit
+    point), then the renames happen. A failure before the journal leaves the
+    ledger as it was; a failure after it is finished by the next load, write
+    or compaction through finish_interrupted_compaction().
+
+    The whole move holds ledger_lock(), so no append can land in the hot file
+    between the snapshot and the rename that replaces it.
+
+    Returns:
+        dict: Months archived, rows moved and the hot file size before and after (bytes).
+    """
+    with ledger_lock(os.path.dirname(transactions_file)):
+        return _compact_locked(transactions_file, archive_dir, keep_months)
+
+
+def _compact_locked(transactions_file: str, archive_dir: str, keep_months: int):
+    finish_interrupted_compaction(archive_dir, locked=True)
+    _discard_staged_files(transactions_file, archive_dir)
+
+    cutoff = oldest_hot_month(keep_months)
+    try:
+        with open(transactions_file, "r") as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        lines = []
+
+    to_archive = {}
+    hot_lines = []
+    for line in lines:
+        row = _parse_line(line)
+        if row is not None and row[0][:7] < cutoff:
+            to_archive.setdefault(row[0][:7], []).append(row)
+        elif line.strip():
+            hot_lines.append(line)
+
+    size_before = sum(len(line.encode("utf-8")) for line in lines)
+    if to_archive:
+        # Segments first, the hot file last; the journal keeps this order
+        renames = [
+            (_stage_segment(archive_dir, month, read_segment_rows(archive_dir, month) + rows),
+             segment_path(archive_dir, month))
+            for month, rows in sorted(to_archive.items())
+        ]
+        hot_tmp_path = transactions_file + ".tmp"
+        with open(hot_tmp_path, "w") as f:
+            f.writelines(hot_lines)
+            f.flush()
+            os.fsync(f.fileno())
+        renames.append((hot_tmp_path, transactions_file))
+
+        journal_tmp_path = _journal_path(archive_dir) + ".tmp"
+        with open(journal_tmp_path, "w") as f:
+            json.dump({"renames": renames}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(journal_tmp_path, _journal_path(archive_dir))
+
+        _apply_journal(archive_dir, renames)
+        size_after = sum(len(line.encode("utf-8")) for line in hot_lines)
+    else:
+        size_after = size_before
+
+    return {
+        "months": sorted(to_archive),
+        "rows": sum(len(rows) for rows in to_archive.values()),
+        "hot_bytes_before": size_before,
+        "hot_bytes_after": size_after,
+    }
@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import pandas as pd
+
+# pyarrow is optional: without it the Parquet export is unavailable and every
+# loader keeps reading the text files.
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+MANIFEST_FILE = "_manifest.json"
+COLUMNS = ["Date", "Type", "Category", "AmountPaisa", "Description"]
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def is_available():
+    return pa is not None
+
+
+def _schema():
+    return pa.schema([
+        ("Date", pa.date32()),
+        ("Type", pa.string()),
+        ("Category", pa.string()),
+        ("AmountPaisa", pa.int64()),
+        ("Description", pa.string()),
+    ])
+
+
+def source_signatures(source_paths):
+    """
+    Returns [mtime, size, inode] of each source file (None if missing).
+
+    mtime alone misses writes within the filesystem's timestamp granularity;
+    lists rather than tuples so the values compare equal after a JSON round trip.
+    """
+    signatures = {}
+    for path in source_paths:
+        try:
+            stat = os.stat(path)
+            signatures[path] = [stat.st_mtime_ns, stat.st_size, stat.st_ino]
+        except FileNotFoundError:
+            signatures[path] = None
+    return signatures
+
+
+def _read_manifest(parquet_dir: str):
+    try:
+        with open(os.path.join(parquet_dir, MANIFEST_FILE), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _partition_dir(parquet_dir: str, month: str):
+    year, month_number = month.split('-')
+    return os.path.join(parquet_dir, f"year={int(year)}", f"month={int(month_number)}")
+
+
+def _fingerprint(month_df):
+    hashes = pd.util.hash_pandas_object(month_df[COLUMNS], index=False)
+    return hashlib.sha1(hashes.values.tobytes()).hexdigest()
+
+
+def _valid_dates(dates):
+    """Flags the dates that are real "YYYY-MM-DD" dates."""
+    well_formed = dates.map(lambda date: isinstance(date, str) and bool(DATE_PATTERN.match(date)))
+    parsed = pd.to_datetime(dates.where(well_formed), format="%Y-%m-%d", errors="coerce")
+    return well_formed & parsed.notna()
+
+
+def sync_dataset(transactions_df, parquet_dir: str, signatures: dict):
+    """
+    Writes the ledger as a Parquet dataset partitioned by year and month.
+
+    Only partitions whose rows changed since the last sync are rewritten, and
+    partitions of months that no longer exist are removed. Rows whose date is
+    not a valid "YYYY-MM-DD" date are skipped and counted.
+
+    Args:
+        transactions_df (pd.DataFrame): The full ledger, as returned by load_transactions().
+        parquet_dir (str): Root directory of the dataset.
+        signatures (dict): source_signatures() of the ledger files, taken *before* they were
+            read, so a write racing the sync makes the export stale rather than hidden.
+
+    Returns:
+        dict: The months rewritten, unchanged and removed, and the number of rows skipped.
+    """
+    if not is_available():
+        raise ImportError("pyarrow is not installed. Please run 'pip install pyarrow' to export to Parquet.")
+
+    manifest = _read_manifest(parquet_dir) or {"partitions": {}}
+    if not transactions_df.empty:
+        valid = _valid_dates(transactions_df['Date'])
+        skipped = int((~valid).sum())
+        transactions_df = transactions_df[valid]
+    else:
+        skipped = 0
+    old_partitions = manifest["partitions"]
+    new_partitions = {}
+    written, unchanged = [], []
+
+    months = transactions_df['Date'].str.slice(0, 7) if not transactions_df.empty else pd.Series(dtype=object)
+    for month, month_df in transactions_df.groupby(months, sort=True):
+        fingerprint = _fingerprint(month_df)
+        new_partitions[month] = fingerprint
+        if old_partitions.get(month) == fingerprint:
+            unchanged.append(month)
+            continue
+
+        # Grouping by Type gives each type its own row groups, whose statistics
+        # let Type filters skip the others
+        month_df = month_df.sort_values(['Type', 'Date'], kind='stable')
+        table = pa.table(
+            {
+                "Date": pd.to_datetime(month_df['Date']).dt.date,
+                "Type": month_df['Type'].astype(str),
+                "Category": month_df['Category'].astype(str),
+                "AmountPaisa": month_df['AmountPaisa'].astype('int64'),
+                "Description": month_df['Description'].fillna("").astype(str),
+            },
+            schema=_schema(),
+        )
+        partition_dir = _partition_dir(parquet_dir, month)
+        os.makedirs(partition_dir, exist_ok=True)
+        # The leading dot keeps a half-written file out of dataset discovery
+        tmp_path = os.path.join(partition_dir, ".part-0.parquet.tmp")
+        with pq.ParquetWriter(tmp_path, _schema()) as writer:
+            for trans_type in month_df['Type'].astype(str).unique():
+                writer.write_table(table.filter(pc.equal(table["Type"], trans_type)))
+        os.replace(tmp_path, os.path.join(partition_dir, "part-0.parquet"))
+        written.append(month)
+
+    removed = sorted(set(old_partitions) - set(new_partitions))
+    for month in removed:
+        shutil.rmtree(_partition_dir(parquet_dir, month), ignore_errors=True)
+
+    os.makedirs(parquet_dir, exist_ok=True)
+    tmp_manifest = os.path.join(parquet_dir, MANIFEST_FILE + ".tmp")
+    with open(tmp_manifest, "w") as f:
+        json.dump({"sources": signatures, "partitions": new_partitions}, f)
+    os.replace(tmp_manifest, os.path.join(parquet_dir, MANIFEST_FILE))
+
+    return {"written": written, "unchanged": unchanged, "removed": removed, "skipped": skipped}
+
+
+def is_fresh(parquet_dir: str, source_paths):
+    """Checks that a dataset exists and that its source files have not changed since the sync."""
+    if not is_available():
+        return False
+    manifest = _read_manifest(parquet_dir)
+    return manifest is not None and manifest["sources"] == source_signatures(source_paths)
+
+
+def _month_filter(start_month: str, end_month: str):
+    """Builds a partition filter for an inclusive "YYYY-MM" range."""
+    expression = None
+    if start_month:
+        year, month = map(int, start_month.split('-'))
+        expression = (ds.field("year") > year) | ((ds.field("year") == year) & (ds.field("month") >= month))
+    if end_month:
+        year, month = map(int, end_month.split('-'))
+        upper = (ds.field("year") < year) | ((ds.field("year") == year) & (ds.field("month") <= month))
+        expression = upper if expression is None else expression & upper
+    return expression
+
+
+def read_transactions(parquet_dir: str, start_month: str = None, end_month: str = None, trans_type: str = None):
+    """
+    Reads transactions back from the dataset, pushing filters down to pyarrow.
+
+    Month bounds prune whole partitions and the type filter skips row groups
+    using the Parquet statistics, so only the data needed is decoded.
+
+    Args:
+        parquet_dir (str): Root directory of the dataset.
+        start_month (str): First "YYYY-MM" month to include.
+        end_month (str): Last "YYYY-MM" month to include.
+        trans_type (str): Only read this type ("Expense" or "Income").
+
+    Returns:
+        pd.DataFrame: Same columns as load_transactions().
+    """
+    dataset = ds.dataset(parquet_dir, format="parquet", partitioning="hive")
+    if not dataset.files:
+        return pd.DataFrame(columns=COLUMNS + ["Amount"])
+
+    expression = _month_filter(start_month, end_month)
+    if trans_type:
+        type_filter = ds.field("Type") == trans_type
+        expression = type_filter if expression is None else expression & type_filter
+
+    table = dataset.to_table(columns=COLUMNS, filter=expression)
+    df = table.to_pandas()
+    df['Date'] = df['Date'].astype(str)
+    df['Amount'] = df['AmountPaisa'] / 100
+    return df
@@ -1,32 +1,137 @@
+import os
+import re
 import pandas as pd
 from datetime import datetime
+from features.common import archive, columnar
 
-# --- Database File Paths ---
+# --- Ledgers ---
+# The default ledger lives directly in database/; every other ledger is a
+# shard directory with the same layout under database/ledgers/<name>/.
+DATABASE_DIR = "database"
+LEDGERS_DIR = os.path.join(DATABASE_DIR, "ledgers")
+DEFAULT_LEDGER = "default"
+LEDGER_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+
+# --- Database File Paths (of the active ledger, see set_active_ledger) ---
+ACTIVE_LEDGER = DEFAULT_LEDGER
 TRANSACTIONS_FILE = "database/transactions.txt"
 BUDGETS_FILE = "database/budgets.txt"
+ARCHIVE_DIR = "database/archive"
+
+TRANSACTION_COLUMNS = ["Date", "Type", "Category", "AmountPaisa", "Description"]
+
+def get_ledger_paths(ledger: str = None):
+    """
+    Returns the database paths of a ledger.
+
+    Args:
+        ledger (str): The ledger name. Defaults to the active ledger.
+
+    Returns:
+        tuple: (transactions_file, budgets_file, archive_dir)
+    """
+    if ledger is None:
+        return TRANSACTIONS_FILE, BUDGETS_FILE, ARCHIVE_DIR
+    base_dir = DATABASE_DIR if ledger == DEFAULT_LEDGER else os.path.join(LEDGERS_DIR, ledger)
+    return (
+        os.path.join(base_dir, "transactions.txt"),
+        os.path.join(base_dir, "budgets.txt"),
+        os.path.join(base_dir, "archive"),
+    )
+
+def list_ledgers():
+    """Returns the names of all ledgers, the default one first."""
+    try:
+        names = sorted(
+            name for name in os.listdir(LEDGERS_DIR)
+            if os.path.isdir(os.path.join(LEDGERS_DIR, name)) and LEDGER_NAME_PATTERN.match(name)
+        )
+    except FileNotFoundError:
+        names = []
+    return [DEFAULT_LEDGER] + [name for name in names if name != DEFAULT_LEDGER]
+
+def create_ledger(ledger: str):
+    """Creates the shard directory for a new ledger."""
+    if not LEDGER_NAME_PATTERN.match(ledger):
+        raise ValueError("Ledger names may only contain letters, digits, '-' and '_'.")
+    if ledger in list_ledgers():
+        raise ValueError(f"Ledger '{ledger}' already exists.")
+    os.makedirs(os.path.dirname(get_ledger_paths(ledger)[0]))
+
+def get_parquet_dir(ledger: str = None):
+    """Returns the Parquet export directory of a ledger (the active one by default)."""
+    return os.path.join(os.path.dirname(get_ledger_paths(ledger)[0]), "parquet")
+
+def _parquet_sources(ledger: str = None):
+    transactions_file, _, archive_dir = get_ledger_paths(ledger)
+    return [transactions_file, archive_dir]
+
+def _is_month(month: str):
+    try:
+        datetime.strptime(month, "%Y-%m")
+        return True
+    except ValueError:
+        return False
+
+def set_active_ledger(ledger: str):
+    """Points every loader (and the CLI features) at another ledger."""
+    global ACTIVE_LEDGER, TRANSACTIONS_FILE, BUDGETS_FILE, ARCHIVE_DIR
+    if ledger not in list_ledgers():
+        raise ValueError(f"Ledger '{ledger}' does not exist.")
+    ACTIVE_LEDGER = ledger
+    TRANSACTIONS_FILE, BUDGETS_FILE, ARCHIVE_DIR = get_ledger_paths(ledger)
 
-def load_transactions():
-    """Loads all transactions from the text file into a pandas DataFrame."""
+def load_transactions(include_archive: bool = True, ledger: str = None):
+    """
+    Loads transactions into a pandas DataFrame.
+
+    Args:
+        include_archive (bool): Also decompress the archived months. When False,
+            only the hot text file (recent months) is read. For totals alone,
+            load_ledger_totals() reads the segment footers instead.
+        ledger (str): The ledger to read. Defaults to the active ledger.
+    """
+    transactions_file, _, archive_dir = get_ledger_paths(ledger)
+    archive.finish_interrupted_compaction(archive_dir)
     try:
         df = pd.read_csv(
-            TRANSACTIONS_FILE,
-            names=["Date", "Type", "Category", "AmountPaisa", "Description"]
+            transactions_file,
+            names=TRANSACTION_COLUMNS,
+            dtype={"Description": str},
+            # An empty description stays "", as in the archive, instead of becoming NaN
+            keep_default_na=False,
         )
         # Ensure 'Amount' is numeric, coerce errors will turn non-numerics into NaT
         df['Amount'] = pd.to_numeric(df['AmountPaisa'], errors='coerce') / 100
         # Drop rows where Amount could not be parsed
         df.dropna(subset=['Amount'], inplace=True)
-        return df
+        df['AmountPaisa'] = pd.to_numeric(df['AmountPaisa']).astype('int64')
     except FileNotFoundError:
-        return pd.DataFrame(columns=["Date", "Type", "Category", "AmountPaisa", "Description", "Amount"])
+        df = pd.DataFrame(columns=TRANSACTION_COLUMNS + ["Amount"])
     except pd.errors.EmptyDataError:
-        return pd.DataFrame(columns=["Date", "Type", "Category", "AmountPaisa", "Description", "Amount"])
+        df = pd.DataFrame(columns=TRANSACTION_COLUMNS + ["Amount"])
+
+    if include_archive:
+        # One DataFrame per segment, built straight from its column lists
+        frames = []
+        for month in archive.list_archived_months(archive_dir):
+            columns = archive.read_segment_columns(archive_dir, month)
+            if columns:
+                frames.append(pd.DataFrame(
+                    {column: columns[name] for column, name in zip(TRANSACTION_COLUMNS, archive.COLUMNS)}
+                ))
+        if frames:
+            archived_df = pd.concat(frames, ignore_index=True)
+            archived_df['AmountPaisa'] = archived_df['AmountPaisa'].astype('int64')
+            archived_df['Amount'] = archived_df['AmountPaisa'] / 100
+            df = pd.concat([archived_df, df], ignore_index=True) if not df.empty else archived_df
+    return df
 
-def load_budgets():
-    """Loads budgets from the text file into a dictionary."""
+def load_budgets(ledger: str = None):
+    """Loads budgets from the text file of a ledger (the active one by default) into a dictionary."""
     budgets = {}
     try:
-        with open(BUDGETS_FILE, "r") as f:
+        with open(get_ledger_paths(ledger)[1], "r") as f:
             for line in f:
                 if line.strip():
                     parts = line.strip().split(',')
@@ -37,27 +142,219 @@ def load_budgets():
         pass
     return budgets
 
-def get_spending_for_month(month_to_analyze: str):
+def get_spending_for_month(month_to_analyze: str, ledger: str = None):
     """
-    Calculates spending per category for a specific month from the transactions file.
+    Calculates spending per category for a specific month.
     
     Args:
         month_to_analyze (str): The month in "YYYY-MM" format.
+        ledger (str): The ledger to read. Defaults to the active ledger.
 
     Returns:
         dict: A dictionary with categories as keys and spent amounts as values.
     """
-    transactions_df = load_transactions()
+    spending = load_month_spending(month_to_analyze, ledger)
+    return {cat: amount_paisa / 100 for cat, amount_paisa in spending.items()}
+
+def load_month_spending(month_to_analyze: str, ledger: str = None):
+    """
+    Returns a month's expense totals per category, in paisa.
+
+    When an up-to-date Parquet export exists, only the Expense row groups of
+    that month's partition are read; otherwise load_month_summary() is used.
+    """
+    parquet_dir = get_parquet_dir(ledger)
+    if columnar.is_fresh(parquet_dir, _parquet_sources(ledger)) and _is_month(month_to_analyze):
+        expenses_df = columnar.read_transactions(
+            parquet_dir, month_to_analyze, month_to_analyze, trans_type="Expense"
+        )
+        expense_by_cat = expenses_df.groupby('Category')['AmountPaisa'].sum().to_dict()
+        return {cat: int(amount_paisa) for cat, amount_paisa in expense_by_cat.items()}
+
+    return load_month_summary(month_to_analyze, ledger)["expense_by_category_paisa"]
+
+def summarize_month(transactions_df, month_to_analyze: str):
+    """
+    Builds an income/expense summary for a month, keeping totals in integer paisa.
+
+    Args:
+        transactions_df (pd.DataFrame): Transactions as returned by load_transactions().
+        month_to_analyze (str): The month in "YYYY-MM" format.
+
+    Returns:
+        dict: Income, expense and net totals plus expense totals per category, all in paisa.
+    """
     if transactions_df.empty:
-        return {}
+        monthly_df = transactions_df
+    else:
+        monthly_df = transactions_df[transactions_df['Date'].str.startswith(month_to_analyze)]
 
-    # Filter for expenses in the given month
-    monthly_expenses = transactions_df[
-        (transactions_df['Type'] == 'Expense') &
-        (transactions_df['Date'].str.startswith(month_to_analyze))
-    ]
-    
-    # Calculate spending per category
-    expense_by_cat = monthly_expenses.groupby('Category')['Amount'].sum().to_dict()
-    
-    return expense_by_cat
+    income_df = monthly_df[monthly_df['Type'] == 'Income']
+    expense_df = monthly_df[monthly_df['Type'] == 'Expense']
+    income_paisa = int(income_df['AmountPaisa'].sum())
+    expense_paisa = int(expense_df['AmountPaisa'].sum())
+    expense_by_cat = expense_df.groupby('Category')['AmountPaisa'].sum().to_dict()
+
+    return {
+        "month": month_to_analyze,
+        "transaction_count": int(len(monthly_df)),
+        "income_paisa": income_paisa,
+        "expense_paisa": expense_paisa,
+        "net_paisa": income_paisa - expense_paisa,
+        "expense_by_category_paisa": {cat: int(amount) for cat, amount in expense_by_cat.items()},
+    }
+
+def sync_parquet(ledger: str = None):
+    """
+    Exports a ledger (the active one by default) as a Parquet dataset
+    partitioned by year and month, rewriting only the months that changed.
+    """
+    # Stamp the sources before reading them, so a concurrent write leaves the export stale
+    signatures = columnar.source_signatures(_parquet_sources(ledger))
+    return columnar.sync_dataset(load_transactions(ledger=ledger), get_parquet_dir(ledger), signatures)
+
+def merge_summaries(month: str, summaries):
+    """Adds up several summaries of the same month, paisa by paisa."""
+    merged = {
+        "month": month,
+        "transaction_count": 0,
+        "income_paisa": 0,
+        "expense_paisa": 0,
+        "net_paisa": 0,
+        "expense_by_category_paisa": {},
+    }
+    for summary in summaries:
+        for key in ("transaction_count", "income_paisa", "expense_paisa", "net_paisa"):
+            merged[key] += summary[key]
+        for category, amount_paisa in summary["expense_by_category_paisa"].items():
+            by_category = merged["expense_by_category_paisa"]
+            by_category[category] = by_category.get(category, 0) + amount_paisa
+    return merged
+
+def load_ledger_totals(ledger: str = None):
+    """
+    Summarizes a ledger's whole history (same shape as summarize_month(), with
+    month set to None) from the archive footers plus the hot text file, so no
+    segment is decompressed.
+    """
+    # An empty month prefix matches every date in the hot file
+    summaries = [summarize_month(load_transactions(include_archive=False, ledger=ledger), "")]
+    archive_dir = get_ledger_paths(ledger)[2]
+    for month in archive.list_archived_months(archive_dir):
+        summaries.append(archive.footer_to_summary(archive.read_segment_footer(archive_dir, month)))
+    return merge_summaries(None, summaries)
+
+def load_month_summary(month_to_analyze: str, ledger: str = None):
+    """
+    Summarizes a month of a ledger (the active one by default) without
+    decompressing archived history.
+
+    Archived months are read from their segment footer and combined with any
+    back-dated rows still in the hot text file. When an up-to-date Parquet
+    export exists, only that month's partition is read instead.
+    """
+    parquet_dir = get_parquet_dir(ledger)
+    if columnar.is_fresh(parquet_dir, _parquet_sources(ledger)) and _is_month(month_to_analyze):
+        monthly_df = columnar.read_transactions(parquet_dir, month_to_analyze, month_to_analyze)
+        return summarize_month(monthly_df, month_to_analyze)
+
+    summary = summarize_month(load_transactions(include_archive=False, ledger=ledger), month_to_analyze)
+    footer = archive.read_segment_footer(get_ledger_paths(ledger)[2], month_to_analyze)
+    if footer is None:
+        return summary
+    return merge_summaries(month_to_analyze, [archive.footer_to_summary(footer), summary])
+
+def calculate_health_score(summary: dict, budgets: dict):
+    """
+    Calculates the financial health score (0-100) from a monthly summary.
+
+    Savings rate contributes up to 60 points (a 20% savings rate earns them all)
+    and budget adherence contributes up to 40 points.
+
+    Args:
+        summary (dict): A summary as returned by summarize_month().
+        budgets (dict): Budgets as returned by load_budgets().
+
+    Returns:
+        dict: The total score and the points earned by each factor.
+    """
+    total_income = summary["income_paisa"] / 100
+    total_expense = summary["expense_paisa"] / 100
+
+    savings_rate_score = 0
+    if total_income > 0:
+        savings_rate = (total_income - total_expense) / total_income
+        savings_rate_score = max(0, min(savings_rate / 0.2, 1)) * 60
+
+    budget_adherence_score = 0
+    if budgets:
+        on_budget_count = 0
+        for category, budget_amount in budgets.items():
+            spent_amount = summary["expense_by_category_paisa"].get(category, 0) / 100
+            if spent_amount <= budget_amount:
+                on_budget_count += 1
+        budget_adherence_score = (on_budget_count / len(budgets)) * 40
+
+    return {
+        "month": summary["month"],
+        "transaction_count": summary["transaction_count"],
+        "score": savings_rate_score + budget_adherence_score,
+        "savings_rate_score": savings_rate_score,
+        "budget_adherence_score": budget_adherence_score,
+    }
+
+def calculate_budget_status(summary: dict, budgets: dict):
+    """
+    Compares a month's spending against the budgets for every category.
+
+    Args:
+        summary (dict): A summary as returned by summarize_month().
+        budgets (dict): Budgets as returned by load_budgets().
+
+    Returns:
+        list: One dict per category with budget, spent, remaining (in paisa),
+              utilization % and a status of "OK", "Warning", "OVER" or "No Budget".
+    """
+    spending = summary["expense_by_category_paisa"]
+    statuses = []
+    for category in sorted(set(budgets.keys()) | set(spending.keys())):
+        budget_paisa = int(round(budgets.get(category, 0) * 100))
+        spent_paisa = spending.get(category, 0)
+
+        if budget_paisa > 0:
+            utilization = (spent_paisa / budget_paisa) * 100
+        else:
+            utilization = 0 if spent_paisa == 0 else 100
+
+        if budget_paisa == 0 and spent_paisa > 0:
+            status = "No Budget"
+        elif utilization > 100:
+            status = "OVER"
+        elif utilization >= 70:
+            status = "Warning"
+        else:
+            status = "OK"
+
+        statuses.append({
+            "category": category,
+            "budget_paisa": budget_paisa,
+            "spent_paisa": spent_paisa,
+            "remaining_paisa": budget_paisa - spent_paisa,
+            "utilization": utilization,
+            "status": status,
+        })
+    return statuses
+
+def build_budget_report(summary: dict, budgets: dict):
+    """Bundles the budgets (in paisa) with calculate_budget_status() for a month."""
+    return {
+        "month": summary["month"],
+        "budgets_paisa": {cat: int(round(amount * 100)) for cat, amount in budgets.items()},
+        "status": calculate_budget_status(summary, budgets),
+    }
+
+def load_budget_report(month_to_analyze: str, ledger: str = None):
+    """Builds build_budget_report() for a month of a ledger, reading only its expenses."""
+    # Budget status only looks at the per-category spending
+    summary = {"month": month_to_analyze, "expense_by_category_paisa": load_month_spending(month_to_analyze, ledger)}
+    return build_budget_report(summary, load_budgets(ledger))
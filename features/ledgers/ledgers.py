@@ -0,0 +1,137 @@
+import os
+import questionary
+from concurrent.futures import ProcessPoolExecutor
+from rich.console import Console
+from rich.table import Table
+from rich.panel import Panel
+from datetime import datetime
+from features.common import utils
+
+# Initialize Rich Console
+console = Console()
+
+
+def consolidate_month(month_to_analyze: str, ledgers: list = None):
+    """
+    Summarizes a month across ledgers, one worker process per shard.
+
+    Each shard is summarized on its own and only the integer-paisa summaries
+    are merged, so no combined DataFrame is ever built.
+
+    Args:
+        month_to_analyze (str): The month in "YYYY-MM" format.
+        ledgers (list): Ledger names to include. Defaults to every ledger.
+
+    Returns:
+        tuple: (consolidated summary, {ledger name: summary})
+    """
+    ledgers = ledgers or utils.list_ledgers()
+    if len(ledgers) == 1:
+        summaries = [utils.load_month_summary(month_to_analyze, ledgers[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=min(len(ledgers), os.cpu_count() or 1)) as executor:
+            summaries = list(executor.map(utils.load_month_summary, [month_to_analyze] * len(ledgers), ledgers))
+
+    per_ledger = dict(zip(ledgers, summaries))
+    return utils.merge_summaries(month_to_analyze, summaries), per_ledger
+
+
+def switch_ledger():
+    """Makes another ledger the active one for the rest of the session."""
+    console.print("\n[bold green]-- Switch Ledger --[/bold green]")
+    ledger = questionary.select(
+        f"Select a ledger (active: {utils.ACTIVE_LEDGER}):",
+        choices=utils.list_ledgers()
+    ).ask()
+
+    if not ledger:
+        console.print("[bold red]Ledger not selected. Aborting.[/bold red]")
+        return
+
+    utils.set_active_ledger(ledger)
+    console.print(f"\n[bold green]Success![/bold green] Now using ledger [bold]{ledger}[/bold].")
+
+
+def create_ledger():
+    """Creates a new, empty ledger and switches to it."""
+    console.print("\n[bold green]-- Create a New Ledger --[/bold green]")
+    ledger = questionary.text("Enter a name for the ledger (letters, digits, '-' and '_'):").ask()
+
+    if not ledger:
+        console.print("[bold red]Name cannot be empty. Aborting.[/bold red]")
+        return
+
+    try:
+        utils.create_ledger(ledger)
+    except (ValueError, OSError) as e:
+        console.print(f"[bold red]Could not create ledger: {e}[/bold red]")
+        return
+
+    utils.set_active_ledger(ledger)
+    console.print(f"\n[bold green]Success![/bold green] Ledger [bold]{ledger}[/bold] created and selected.")
+
+
+def consolidated_report():
+    """Shows a month's income and expenses across every ledger."""
+    console.print("\n[bold blue]-- Consolidated Report (All Ledgers) --[/bold blue]")
+
+    current_month_str = datetime.now().strftime("%Y-%m")
+    month_to_analyze = questionary.text(
+        "Enter the month to analyze (e.g., YYYY-MM):",
+        default=current_month_str
+    ).ask()
+
+    if not month_to_analyze:
+        console.print("[bold red]Month not provided. Aborting.[/bold red]")
+        return
+
+    try:
+        datetime.strptime(month_to_analyze, "%Y-%m")
+    except ValueError:
+        console.print("[bold red]Invalid format. Please use YYYY-MM.[/bold red]")
+        return
+
+    total, per_ledger = consolidate_month(month_to_analyze)
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Ledger", style="cyan")
+    table.add_column("Transactions", justify="right")
+    table.add_column("Income", justify="right", style="green")
+    table.add_column("Expense", justify="right", style="red")
+    table.add_column("Net", justify="right")
+
+    for ledger, summary in per_ledger.items():
+        table.add_row(
+            ledger,
+            str(summary["transaction_count"]),
+            f"{summary['income_paisa'] / 100:.2f}",
+            f"{summary['expense_paisa'] / 100:.2f}",
+            f"{summary['net_paisa'] / 100:.2f}",
+        )
+    console.print(table)
+
+    summary_text = (
+        f"Total Income:  [bold green]{total['income_paisa'] / 100:.2f}[/bold green]\n"
+        f"Total Expense: [bold red]{total['expense_paisa'] / 100:.2f}[/bold red]\n"
+        f"Net Savings:   [bold cyan]{total['net_paisa'] / 100:.2f}[/bold cyan]"
+    )
+    console.print(Panel(summary_text, title=f"[bold]All Ledgers for {month_to_analyze}[/bold]", expand=False))
+
+
+def handle_ledgers():
+    """Main function for the ledger feature."""
+    while True:
+        console.print(f"\n[bold cyan]Ledgers[/bold cyan] (active: [bold]{utils.ACTIVE_LEDGER}[/bold])")
+        choice = questionary.select(
+            "What would you like to do?",
+            choices=["Switch Ledger", "Create Ledger", "Consolidated Report", "Back to Main Menu"]
+        ).ask()
+
+        if choice == "Switch Ledger":
+            switch_ledger()
+        elif choice == "Create Ledger":
+            create_ledger()
+        elif choice == "Consolidated Report":
+            consolidated_report()
+        elif choice == "Back to Main Menu" or choice is None:
+            break
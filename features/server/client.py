@@ -0,0 +1,111 @@
+import json
+import pandas as pd
+from urllib.error import URLError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+from features.common import utils
+from features.server.server import HOST, PORT
+
+# Keep this short so the CLI falls back quickly when no server is running
+REQUEST_TIMEOUT_SECONDS = 0.5
+# Whole-ledger payloads can take far longer than that to arrive
+BULK_REQUEST_TIMEOUT_SECONDS = 30
+
+
+def fetch_json(path: str, timeout: float = REQUEST_TIMEOUT_SECONDS, **params):
+    """
+    Fetches a JSON endpoint from the local API server.
+
+    Returns:
+        dict or None: The decoded payload, or None if the server is not reachable.
+    """
+    url = f"http://{HOST}:{PORT}{path}"
+    if params:
+        url += "?" + urlencode(params)
+    try:
+        with urlopen(url, timeout=timeout) as response:
+            return json.loads(response.read())
+    except (URLError, OSError, ValueError):
+        return None
+
+
+def _to_dataframe(transactions: list):
+    """Turns /transactions records into the DataFrame shape of utils.load_transactions()."""
+    df = pd.DataFrame(
+        [
+            (t["date"], t["type"], t["category"], t["amount_paisa"], t["description"])
+            for t in transactions
+        ],
+        columns=utils.TRANSACTION_COLUMNS,
+    )
+    df['AmountPaisa'] = df['AmountPaisa'].astype('int64')
+    df['Amount'] = df['AmountPaisa'] / 100
+    return df
+
+
+def load_transactions(ledger: str = None):
+    """Loads a ledger's transactions from the API server, falling back to the text file."""
+    ledger = ledger or utils.ACTIVE_LEDGER
+    payload = fetch_json("/transactions", timeout=BULK_REQUEST_TIMEOUT_SECONDS, ledger=ledger)
+    if payload is None:
+        return utils.load_transactions(ledger=ledger)
+    return _to_dataframe(payload["transactions"])
+
+
+def load_recent_transactions(limit: int = 10, ledger: str = None):
+    """Loads only the last `limit` transactions of a ledger, from the API server if it is running."""
+    ledger = ledger or utils.ACTIVE_LEDGER
+    payload = fetch_json("/transactions", limit=limit, ledger=ledger)
+    if payload is not None:
+        return _to_dataframe(payload["transactions"])
+
+    # The newest rows are in the hot file; the archive is only read if it is too short
+    hot_df = utils.load_transactions(include_archive=False, ledger=ledger)
+    if len(hot_df) < limit:
+        hot_df = utils.load_transactions(ledger=ledger)
+    return hot_df.tail(limit)
+
+
+def get_ledger_totals(ledger: str = None):
+    """Returns a ledger's all-time totals (see utils.load_ledger_totals()), from the API server if it is running."""
+    ledger = ledger or utils.ACTIVE_LEDGER
+    payload = fetch_json("/totals", ledger=ledger)
+    if payload is None:
+        return utils.load_ledger_totals(ledger)
+    return payload
+
+
+def load_budgets(ledger: str = None):
+    """Loads a ledger's budgets from the API server, falling back to the text file."""
+    ledger = ledger or utils.ACTIVE_LEDGER
+    payload = fetch_json("/budgets", ledger=ledger)
+    if payload is None:
+        return utils.load_budgets(ledger)
+    return {category: amount_paisa / 100 for category, amount_paisa in payload["budgets_paisa"].items()}
+
+
+def get_budget_status(month: str, ledger: str = None):
+    """Returns build_budget_report() for a month, from the API server if it is running."""
+    ledger = ledger or utils.ACTIVE_LEDGER
+    payload = fetch_json("/budgets", month=month, ledger=ledger)
+    if payload is None:
+        return utils.load_budget_report(month, ledger)
+    return payload
+
+
+def get_monthly_summary(month: str, ledger: str = None):
+    """Returns summarize_month() for a month, from the API server if it is running."""
+    ledger = ledger or utils.ACTIVE_LEDGER
+    payload = fetch_json("/summary", month=month, ledger=ledger)
+    if payload is None:
+        return utils.load_month_summary(month, ledger)
+    return payload
+
+
+def get_health_score(month: str, ledger: str = None):
+    """Returns calculate_health_score() for a month, from the API server if it is running."""
+    ledger = ledger or utils.ACTIVE_LEDGER
+    payload = fetch_json("/health", month=month, ledger=ledger)
+    if payload is None:
+        return utils.calculate_health_score(utils.load_month_summary(month, ledger), utils.load_budgets(ledger))
+    return payload
@@ -0,0 +1,256 @@
+import asyncio
+import json
+import os
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qs
+from rich.console import Console
+from features.common import utils
+
+# Initialize Rich Console
+console = Console()
+
+# --- Server Settings ---
+HOST = "127.0.0.1"
+PORT = 8765
+WATCH_INTERVAL_SECONDS = 1.0
+
+
+class LedgerCache:
+    """Keeps one ledger and its per-month aggregates warm in memory."""
+
+    def __init__(self, ledger: str):
+        self.ledger = ledger
+        self.transactions_df = None
+        self.budgets = {}
+        self._records = []
+        self._transactions_body = b'{"transactions": []}'
+        self._summaries = {}
+        self._signatures = None
+        # Serializes reloads so concurrent requests do not parse the same files twice
+        self.lock = asyncio.Lock()
+
+    def _file_signatures(self):
+        """Returns (mtime, size, inode) of each database file (None if missing)."""
+        signatures = {}
+        # mtime alone misses writes within the filesystem's timestamp granularity;
+        # size and inode catch most of those, and compaction's renames change the inode.
+        # Replacing segments bumps the archive directory's own mtime.
+        for path in utils.get_ledger_paths(self.ledger):
+            try:
+                stat = os.stat(path)
+                signatures[path] = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+            except FileNotFoundError:
+                signatures[path] = None
+        return signatures
+
+    def is_stale(self):
+        """Checks whether the database files changed since the last load."""
+        return self._file_signatures() != self._signatures
+
+    def reload(self):
+        """Parses the database files and drops every cached aggregate."""
+        signatures = self._file_signatures()
+        transactions_df = utils.load_transactions(ledger=self.ledger)
+        budgets = utils.load_budgets(self.ledger)
+        records = [
+            {
+                "date": row.Date,
+                "type": row.Type,
+                "category": row.Category,
+                "amount_paisa": int(row.AmountPaisa),
+                "description": row.Description if isinstance(row.Description, str) else "",
+            }
+            for row in transactions_df.itertuples(index=False)
+        ]
+        # Encoded here, in the worker thread, so the event loop never serializes the whole ledger
+        transactions_body = json.dumps({"transactions": records}).encode("utf-8")
+        # Swap everything in at once so requests never see a half-loaded ledger
+        self.transactions_df, self.budgets, self._records = transactions_df, budgets, records
+        self._transactions_body = transactions_body
+        self._summaries = {}
+        self._signatures = signatures
+
+    def transactions_body(self, month=None, limit=None):
+        """
+        Returns the encoded /transactions payload, optionally for one month
+        and/or only the last `limit` records. Run it in a worker thread unless
+        both are unset, in which case the body encoded by reload() is returned.
+        """
+        if not month and not limit:
+            return self._transactions_body
+        records = self._records
+        if month:
+            records = [record for record in records if record["date"].startswith(month)]
+        if limit:
+            records = records[-limit:]
+        return json.dumps({"transactions": records}).encode("utf-8")
+
+    def summary(self, month):
+        if month not in self._summaries:
+            self._summaries[month] = utils.summarize_month(self.transactions_df, month)
+        return self._summaries[month]
+
+    def totals(self):
+        """All-time totals of the ledger, in the same shape as summary()."""
+        if None not in self._summaries:
+            # An empty month prefix matches every date
+            totals = utils.summarize_month(self.transactions_df, "")
+            self._summaries[None] = {**totals, "month": None}
+        return self._summaries[None]
+
+    def budget_status(self, month):
+        return utils.build_budget_report(self.summary(month), self.budgets)
+
+    def health_score(self, month):
+        return utils.calculate_health_score(self.summary(month), self.budgets)
+
+
+async def refresh_cache(cache: LedgerCache):
+    """
+    Reloads a cache if its files changed since the last load.
+
+    Returns:
+        bool: True if the cache was reloaded.
+    """
+    async with cache.lock:
+        if not cache.is_stale():
+            return False
+        # Parse in a worker thread so other clients keep being served meanwhile
+        await asyncio.to_thread(cache.reload)
+        return True
+
+
+async def watch_database(caches: dict):
+    """Polls the database files so caches are warm again soon after a change."""
+    while True:
+        await asyncio.sleep(WATCH_INTERVAL_SECONDS)
+        for cache in list(caches.values()):
+            try:
+                if await refresh_cache(cache):
+                    console.print(f"[dim]Database changed on disk. Ledger '{cache.ledger}' reloaded.[/dim]")
+            except Exception as e:
+                console.print(f"[bold red]Error reloading ledger '{cache.ledger}': {e}[/bold red]")
+
+
+async def get_cache(caches: dict, ledger: str):
+    """
+    Returns the up-to-date cache of a ledger.
+
+    A new cache counts as stale, so its first load also happens in a worker
+    thread through refresh_cache() and never blocks other clients.
+    """
+    if ledger not in caches:
+        caches[ledger] = LedgerCache(ledger)
+    cache = caches[ledger]
+    # A stat per request is cheap and catches writes the watcher has not polled yet.
+    # It is not a guarantee: a rewrite that keeps mtime, size and inode unchanged goes unnoticed.
+    await refresh_cache(cache)
+    return cache
+
+
+async def route_request(caches: dict, path: str, params: dict):
+    """Maps a request path to a (status, payload) pair. The payload may already be encoded bytes."""
+    if path == "/ping":
+        return 200, {"status": "ok"}
+
+    month = params.get("month", datetime.now().strftime("%Y-%m"))
+    if path not in ("/transactions", "/totals") or "month" in params:
+        try:
+            datetime.strptime(month, "%Y-%m")
+        except ValueError:
+            return 400, {"error": "Invalid month. Please use YYYY-MM."}
+
+    if path == "/consolidated":
+        ledger_caches = await asyncio.gather(*(get_cache(caches, ledger) for ledger in utils.list_ledgers()))
+        return 200, utils.merge_summaries(month, [cache.summary(month) for cache in ledger_caches])
+
+    ledger = params.get("ledger", utils.DEFAULT_LEDGER)
+    if ledger not in utils.list_ledgers():
+        return 404, {"error": f"Unknown ledger: {ledger}"}
+    cache = await get_cache(caches, ledger)
+
+    if path == "/health":
+        return 200, cache.health_score(month)
+    if path == "/totals":
+        return 200, cache.totals()
+    if path == "/transactions":
+        limit = params.get("limit")
+        if limit is not None:
+            if not limit.isdigit() or int(limit) == 0:
+                return 400, {"error": "Invalid limit. Please use a positive whole number."}
+            limit = int(limit)
+        if not params.get("month") and not limit:
+            return 200, cache.transactions_body()
+        return 200, await asyncio.to_thread(cache.transactions_body, params.get("month"), limit)
+    if path == "/summary":
+        return 200, cache.summary(month)
+    if path == "/budgets":
+        return 200, cache.budget_status(month)
+    return 404, {"error": f"Unknown endpoint: {path}"}
+
+
+async def handle_client(caches: dict, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Serves a single HTTP/1.0-style GET request and closes the connection."""
+    try:
+        request_line = await reader.readline()
+        # Drain the headers; the request body is never used
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+
+        try:
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            status, payload = 400, {"error": "Malformed request."}
+        else:
+            if method != "GET":
+                status, payload = 405, {"error": "Only GET is supported."}
+            else:
+                url = urlsplit(target)
+                params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                try:
+                    status, payload = await route_request(caches, url.path, params)
+                except Exception as e:
+                    status, payload = 500, {"error": f"Error loading ledger: {e}"}
+
+        # Large payloads arrive pre-encoded; the remaining ones are small summaries
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}[status]
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str = HOST, port: int = PORT):
+    """Loads the default ledger once (others on first request) and serves them until cancelled."""
+    caches = {}
+    await get_cache(caches, utils.DEFAULT_LEDGER)
+    server = await asyncio.start_server(lambda r, w: handle_client(caches, r, w), host, port)
+    watcher = asyncio.create_task(watch_database(caches))
+    console.print(f"[bold green]API server listening on http://{host}:{port}[/bold green]")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        watcher.cancel()
+
+
+def run_server(host: str = HOST, port: int = PORT):
+    """Runs the API server in the foreground until Ctrl+C is pressed."""
+    try:
+        asyncio.run(serve(host, port))
+    except KeyboardInterrupt:
+        console.print("\n[bold yellow]API server stopped.[/bold yellow]")
+    except OSError as e:
+        console.print(f"[bold red]Could not start API server on {host}:{port}: {e}[/bold red]")
+
+
+if __name__ == "__main__":
+    run_server()
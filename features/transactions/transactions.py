@@ -1,7 +1,13 @@
+import json
+import os
+import sys
 import questionary
 from rich.console import Console
 from rich.table import Table
 from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from features.common import archive, utils
 
 # Initialize Rich Console
 console = Console()
@@ -10,8 +16,103 @@ console = Console()
 EXPENSE_CATEGORIES = ["Food", "Transport", "Shopping", "Bills", "Entertainment", "Health", "Other"]
 INCOME_CATEGORIES = ["Salary", "Freelance", "Business", "Investment", "Gift", "Other"]
 
-# Database file
-TRANSACTIONS_FILE = "database/transactions.txt"
+# Writes are buffered in memory and flushed once when the file is closed
+WRITE_BUFFER_BYTES = 1024 * 1024
+
+
+def parse_amount(amount_str):
+    """
+    Converts an amount such as "12.50" into integer paisa.
+
+    Raises:
+        ValueError: If the amount is not a positive number with at most 2 decimal places.
+    """
+    if isinstance(amount_str, bool) or not isinstance(amount_str, (str, int, float)):
+        raise ValueError("Invalid amount. Please enter a number.")
+    try:
+        amount = Decimal(str(amount_str).strip())
+        if not amount.is_finite():
+            raise ValueError("Invalid amount. Please enter a number.")
+        if amount != amount.quantize(Decimal("0.01")):
+            raise ValueError("Amount can have at most 2 decimal places.")
+    except InvalidOperation:
+        raise ValueError("Invalid amount. Please enter a number.")
+    amount_paisa = int(amount * 100)
+    if amount_paisa <= 0:
+        raise ValueError("Amount must be positive.")
+    return amount_paisa
+
+
+@lru_cache(maxsize=4096)
+def parse_date(date_str):
+    """
+    Validates a "YYYY-MM-DD" date. Results are cached since imports repeat dates a lot.
+
+    Raises:
+        ValueError: If the date is not a valid "YYYY-MM-DD" date.
+    """
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f"Invalid date '{date_str}'. Please use YYYY-MM-DD.")
+
+
+def build_transaction_record(transaction_type, category, amount, description=None, date=None):
+    """
+    Validates a transaction and formats it as a line of the transactions file.
+
+    Args:
+        transaction_type (str): "Expense" or "Income".
+        category (str): One of the categories for that type.
+        amount (str): The amount, e.g. "12.50" (a number is accepted too).
+        description (str): A short description. Commas are replaced by spaces.
+        date (str): The date in "YYYY-MM-DD" format. Defaults to today; past dates are allowed.
+
+    Raises:
+        ValueError: If any field is invalid.
+    """
+    if transaction_type == "Expense":
+        categories = EXPENSE_CATEGORIES
+    elif transaction_type == "Income":
+        categories = INCOME_CATEGORIES
+    else:
+        raise ValueError(f"Invalid transaction type '{transaction_type}'. Use Expense or Income.")
+
+    if category not in categories:
+        raise ValueError(f"Invalid {transaction_type} category '{category}'. Choose from: {', '.join(categories)}.")
+
+    amount_paisa = parse_amount(amount)
+
+    if date is not None and not isinstance(date, str):
+        raise ValueError(f"Invalid date {date!r}. Please use YYYY-MM-DD.")
+    transaction_date = parse_date(date) if date else datetime.now().strftime("%Y-%m-%d")
+
+    if description is not None and not isinstance(description, str):
+        raise ValueError(f"Invalid description {description!r}. It must be text.")
+    # splitlines() covers every line break ("\r", "\r\n", "\u2028", ...), not just "\n"
+    description = " ".join((description or "No description").replace(',', ' ').splitlines())
+
+    # Format: date,type,category,amount_paisa,description
+    return f"{transaction_date},{transaction_type},{category},{amount_paisa},{description}\n"
+
+
+def write_transaction_records(records):
+    """
+    Appends formatted records through one buffered file handle and returns how many were written.
+
+    The ledger lock keeps a compaction from replacing the file mid-append, and
+    an interrupted compaction is finished first so its pending rename cannot
+    overwrite the new rows later.
+    """
+    count = 0
+    with archive.ledger_lock(os.path.dirname(utils.TRANSACTIONS_FILE)):
+        archive.finish_interrupted_compaction(utils.ARCHIVE_DIR, locked=True)
+        with open(utils.TRANSACTIONS_FILE, "a", buffering=WRITE_BUFFER_BYTES) as f:
+            for record in records:
+                f.write(record)
+                count += 1
+    return count
+
 
 def add_transaction():
     """Adds a new transaction (expense or income) to the database file."""
@@ -41,14 +142,10 @@ def add_transaction():
             console.print("[bold red]Amount cannot be empty. Aborting.[/bold red]")
             return
         try:
-            amount_float = float(amount_str)
-            if amount_float <= 0:
-                console.print("[bold red]Amount must be positive.[/bold red]")
-                continue
-            amount_paisa = int(amount_float * 100)
+            parse_amount(amount_str)
             break
-        except ValueError:
-            console.print("[bold red]Invalid amount. Please enter a number.[/bold red]")
+        except ValueError as e:
+            console.print(f"[bold red]{e}[/bold red]")
 
     description = questionary.text("Enter a short description:").ask()
     if not description:
@@ -56,33 +153,127 @@ def add_transaction():
     
     if ',' in description:
         console.print("[yellow]Warning: Commas in description are not allowed and have been removed.[/yellow]")
-        description = description.replace(',', ' ')
 
 
-    transaction_date = datetime.now().strftime("%Y-%m-%d")
+    while True:
+        transaction_date = questionary.text(
+            "Enter the date (YYYY-MM-DD):",
+            default=datetime.now().strftime("%Y-%m-%d")
+        ).ask()
+        if transaction_date is None:
+            console.print("[bold red]Date not provided. Aborting.[/bold red]")
+            return
+        try:
+            if transaction_date:
+                parse_date(transaction_date)
+            break
+        except ValueError as e:
+            console.print(f"[bold red]{e}[/bold red]")
 
-    # Format: date,type,category,amount_paisa,description
-    transaction_record = f"{transaction_date},{transaction_type},{category},{amount_paisa},{description}\n"
+    transaction_record = build_transaction_record(transaction_type, category, amount_str, description, transaction_date)
 
     try:
-        with open(TRANSACTIONS_FILE, "a") as f:
-            f.write(transaction_record)
+        write_transaction_records([transaction_record])
         console.print(f"\n[bold green]Success![/bold green] Transaction added: {transaction_type} of {amount_str} in {category}.")
     except IOError as e:
-        console.print(f"[bold red]Error writing to file {TRANSACTIONS_FILE}: {e}[/bold red]")
+        console.print(f"[bold red]Error writing to file {utils.TRANSACTIONS_FILE}: {e}[/bold red]")
+
+
+def add_transaction_from_args(transaction_type, category, amount, description=None, date=None):
+    """Adds a single transaction without prompting (used by `main.py add`)."""
+    try:
+        record = build_transaction_record(transaction_type, category, amount, description, date)
+        write_transaction_records([record])
+    except ValueError as e:
+        console.print(f"[bold red]{e}[/bold red]")
+        return False
+    except IOError as e:
+        console.print(f"[bold red]Error writing to file {utils.TRANSACTIONS_FILE}: {e}[/bold red]")
+        return False
+    console.print(f"[bold green]Success![/bold green] Transaction added: {transaction_type} of {amount} in {category}.")
+    return True
+
+
+def import_transactions(lines):
+    """
+    Adds many transactions from JSON Lines, e.g.
+    {"type": "Expense", "category": "Food", "amount": "12.50", "date": "2025-11-20", "description": "Lunch"}
+
+    Every line goes through the same validation as the prompts. The batch is
+    all-or-nothing: if any line is invalid nothing is written, so the file can
+    be fixed and imported again without duplicating the valid lines. Otherwise
+    all records are written with a single buffered flush.
+
+    Returns:
+        tuple: (number of transactions added, list of error messages)
+    """
+    records = []
+    errors = []
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+            if not isinstance(entry, dict):
+                raise ValueError("Expected a JSON object.")
+            records.append(build_transaction_record(
+                entry.get("type"),
+                entry.get("category"),
+                entry.get("amount"),
+                entry.get("description"),
+                entry.get("date"),
+            ))
+        except ValueError as e:
+            errors.append(f"Line {line_number}: {e}")
+
+    if errors:
+        return 0, errors
+    return write_transaction_records(records), errors
+
+
+def import_transactions_from_file(path):
+    """Imports a JSON Lines file (or stdin when path is "-") and prints a summary."""
+    try:
+        if path == "-":
+            added, errors = import_transactions(sys.stdin)
+        else:
+            with open(path, "r") as f:
+                added, errors = import_transactions(f)
+    except IOError as e:
+        console.print(f"[bold red]Error importing transactions: {e}[/bold red]")
+        return False
+
+    if errors:
+        for error in errors[:10]:
+            console.print(f"[dim red]{error}[/dim red]")
+        if len(errors) > 10:
+            console.print(f"[dim red]... and {len(errors) - 10} more invalid lines.[/dim red]")
+        console.print(f"[bold red]Import aborted: {len(errors)} invalid lines. No transactions were added.[/bold red]")
+        return False
+
+    console.print(f"[bold green]Success![/bold green] Imported {added} transactions.")
+    return True
 
 
 def view_transactions():
     """Reads and displays all transactions from the database file in a table."""
     console.print("\n[bold yellow]-- All Transactions --[/bold yellow]")
+    # Archived months come first, followed by the hot file
+    archive.finish_interrupted_compaction(utils.ARCHIVE_DIR)
+    archived_lines = [
+        f"{date},{trans_type},{category},{amount_paisa},{description}\n"
+        for date, trans_type, category, amount_paisa, description in archive.read_all_archived_rows(utils.ARCHIVE_DIR)
+    ]
     try:
-        with open(TRANSACTIONS_FILE, "r") as f:
-            lines = f.readlines()
+        with open(utils.TRANSACTIONS_FILE, "r") as f:
+            lines = archived_lines + f.readlines()
     except FileNotFoundError:
-        console.print("[bold red]No transactions found. The transaction file does not exist.[/bold red]")
-        return
+        if not archived_lines:
+            console.print("[bold red]No transactions found. The transaction file does not exist.[/bold red]")
+            return
+        lines = archived_lines
     except IOError as e:
-        console.print(f"[bold red]Error reading file {TRANSACTIONS_FILE}: {e}[/bold red]")
+        console.print(f"[bold red]Error reading file {utils.TRANSACTIONS_FILE}: {e}[/bold red]")
         return
 
     if not lines:
@@ -120,18 +311,71 @@ def view_transactions():
     console.print(table)
 
 
+def compact_history():
+    """Moves closed months out of the transactions file into compressed archive segments."""
+    console.print("\n[bold yellow]-- Compact Old History --[/bold yellow]")
+    console.print(
+        f"Months before [bold]{archive.oldest_hot_month()}[/bold] will be moved to {utils.ARCHIVE_DIR}. "
+        "Reports stay the same."
+    )
+    if not questionary.confirm("Continue?").ask():
+        console.print("[bold red]Compaction cancelled.[/bold red]")
+        return
+
+    try:
+        result = archive.compact_ledger(utils.TRANSACTIONS_FILE, utils.ARCHIVE_DIR)
+    except (IOError, ValueError) as e:
+        console.print(f"[bold red]Error compacting {utils.TRANSACTIONS_FILE}: {e}[/bold red]")
+        return
+
+    if not result["months"]:
+        console.print("[bold]Nothing to compact. All transactions are from recent months.[/bold]")
+        return
+
+    console.print(
+        f"\n[bold green]Success![/bold green] Archived {result['rows']} transactions from "
+        f"{', '.join(result['months'])}. Transactions file: {result['hot_bytes_before']} -> "
+        f"{result['hot_bytes_after']} bytes."
+    )
+
+
+def sync_parquet_export():
+    """Exports the ledger as a Parquet dataset partitioned by year and month."""
+    console.print("\n[bold yellow]-- Sync Parquet Export --[/bold yellow]")
+    try:
+        result = utils.sync_parquet()
+    except ImportError as e:
+        console.print(f"[bold red]Error: {e}[/bold red]")
+        return
+    except (IOError, ValueError) as e:
+        console.print(f"[bold red]Error writing Parquet export: {e}[/bold red]")
+        return
+
+    console.print(
+        f"\n[bold green]Success![/bold green] Exported to {utils.get_parquet_dir()}: "
+        f"{len(result['written'])} months rewritten, {len(result['unchanged'])} unchanged, "
+        f"{len(result['removed'])} removed."
+    )
+    if result["skipped"]:
+        console.print(f"[yellow]Warning: {result['skipped']} transactions with an invalid date were not exported.[/yellow]")
+
+
 def handle_transactions():
     """Main function for the transaction feature."""
     while True:
         console.print("\n[bold cyan]Transaction Management[/bold cyan]")
         choice = questionary.select(
             "What would you like to do?",
-            choices=["Add Transaction", "View Transactions", "Back to Main Menu"]
+            choices=["Add Transaction", "View Transactions", "Compact Old History", "Sync Parquet Export", "Back to Main Menu"]
         ).ask()
 
         if choice == "Add Transaction":
             add_transaction()
         elif choice == "View Transactions":
             view_transactions()
+        elif choice == "Compact Old History":
+            compact_history()
+        elif choice == "Sync Parquet Export":
+            sync_parquet_export()
         elif choice == "Back to Main Menu" or choice is None:
             break
@@ -1,10 +1,20 @@
 import questionary
 from rich.console import Console
+import argparse
 import subprocess
 import sys
-from features.transactions.transactions import handle_transactions
+from features.transactions.transactions import (
+    EXPENSE_CATEGORIES,
+    INCOME_CATEGORIES,
+    add_transaction_from_args,
+    handle_transactions,
+    import_transactions_from_file,
+)
 from features.budgets.budgets import handle_budgets
 from features.analytics.analytics import handle_analytics
+from features.ledgers.ledgers import handle_ledgers
+from features.server.server import run_server
+from features.common import utils
 
 console = Console()
 
@@ -15,7 +25,7 @@ def launch_dashboard():
     console.print("Press [bold]Ctrl+C[/bold] in this terminal to stop the dashboard.")
     try:
         process = subprocess.Popen(
-            [sys.executable, "-m", "streamlit", "run", "dashboard.py"],
+            [sys.executable, "-m", "streamlit", "run", "dashboard.py", "--", "--ledger", utils.ACTIVE_LEDGER],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE
         )
@@ -29,6 +39,13 @@ def launch_dashboard():
     except Exception as e:
         console.print(f"[bold red]An unexpected error occurred: {e}[/bold red]")
 
+def launch_api_server():
+    """Runs the local API server that keeps the ledger warm for the CLI and dashboard."""
+    console.print("\n[bold yellow]Starting the local API server...[/bold yellow]")
+    console.print("Open another terminal to use the CLI or dashboard against it.")
+    console.print("Press [bold]Ctrl+C[/bold] in this terminal to stop the server.")
+    run_server()
+
 
 def main_menu():
     while True:
@@ -38,7 +55,9 @@ def main_menu():
                 "Transaction Management",
                 "Budgeting",
                 "Financial Analytics (CLI)",
+                "Ledgers",
                 "Launch Web Dashboard",
+                "Start API Server",
                 "Exit"
             ]
         ).ask()
@@ -49,14 +68,60 @@ def main_menu():
             handle_budgets()
         elif choice == "Financial Analytics (CLI)":
             handle_analytics()
+        elif choice == "Ledgers":
+            handle_ledgers()
         elif choice == "Launch Web Dashboard":
             launch_dashboard()
+        elif choice == "Start API Server":
+            launch_api_server()
         elif choice == "Exit" or choice is None:
             console.print("[bold red]Exiting the application. Goodbye![/bold red]")
             break
 
 def main():
+    parser = argparse.ArgumentParser(description="Personal Finance Tracker CLI")
+    parser.add_argument("--ledger", default=utils.DEFAULT_LEDGER, help="Name of the ledger to open")
+    # Lets --ledger also follow the subcommand; SUPPRESS keeps the subcommand
+    # from resetting a --ledger given before it
+    ledger_parser = argparse.ArgumentParser(add_help=False)
+    ledger_parser.add_argument("--ledger", default=argparse.SUPPRESS, help="Name of the ledger to open")
+    subparsers = parser.add_subparsers(dest="command")
+
+    add_parser = subparsers.add_parser("add", parents=[ledger_parser], help="Add a transaction without prompts")
+    add_parser.add_argument("--type", required=True, choices=["Expense", "Income"])
+    add_parser.add_argument(
+        "--category", required=True,
+        help=f"Expense: {', '.join(EXPENSE_CATEGORIES)}. Income: {', '.join(INCOME_CATEGORIES)}"
+    )
+    add_parser.add_argument("--amount", required=True, help="Amount, e.g. 12.50")
+    add_parser.add_argument("--date", help="Date in YYYY-MM-DD format (default: today)")
+    add_parser.add_argument("--description", help="Short description")
+
+    import_parser = subparsers.add_parser(
+        "import", parents=[ledger_parser], help="Add many transactions from JSON Lines"
+    )
+    import_parser.add_argument(
+        "file", nargs="?", default="-",
+        help='JSON Lines file with "type", "category", "amount", "date" and "description" keys (default: stdin)'
+    )
+
+    args = parser.parse_args()
+
+    try:
+        utils.set_active_ledger(args.ledger)
+    except ValueError as e:
+        console.print(f"[bold red]{e}[/bold red] Available ledgers: {', '.join(utils.list_ledgers())}")
+        sys.exit(1)
+
+    if args.command == "add":
+        ok = add_transaction_from_args(args.type, args.category, args.amount, args.description, args.date)
+        sys.exit(0 if ok else 1)
+    if args.command == "import":
+        ok = import_transactions_from_file(args.file)
+        sys.exit(0 if ok else 1)
+
     console.print("[bold cyan]Welcome to Personal Finance Tracker CLI![/bold cyan]")
+    console.print(f"Using ledger: [bold]{utils.ACTIVE_LEDGER}[/bold]")
     main_menu()
 
 if __name__ == "__main__":